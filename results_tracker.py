@@ -13,10 +13,21 @@ Expected environment variables:
 import os
 import json
 import time
-import requests
+import asyncio
+import httpx
 import base64
+import concurrent.futures
+import functools
+import hashlib
+import heapq
+import math
 from datetime import datetime, timezone, timedelta
 
+try:
+    import orjson # Much faster (de)serialization of the growing metrics file
+except ImportError:
+    orjson = None
+
 # --- Configuration Constants ---
 GITHUB_API_URL = "https://api.github.com"
 OWNER = "zipaJopa"
@@ -26,7 +37,12 @@ AGENT_RESULTS_REPO_FULL = f"{OWNER}/{AGENT_RESULTS_REPO_NAME}"
 OUTPUTS_DIR = "outputs"
 PROCESSED_OUTPUTS_DIR = "processed_outputs"
 METRICS_DIR = "metrics"
+METRICS_EVENTS_DIR = f"{METRICS_DIR}/events" # Per-task value rows, sharded as {date}/{HH}.jsonl
 DASHBOARD_FILE = "CONSTELLATION_STATUS.md" # Matching the self_test.py output file
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504} # Transient API/gateway failures worth retrying
+MAX_CONCURRENT_REQUESTS = 8 # Upper bound on GitHub API calls in flight at once, across all phases
+GRAPHQL_BLOBS_PER_QUERY = 100 # Blob contents fetched per GraphQL query; keeps each response well within API limits
+PARALLEL_PARSE_MIN_BYTES = 8 * 1024 * 1024 # Below this much fetched content, worker start-up costs more than parallel parsing saves
 
 # Value estimation logic (can be expanded)
 # For crypto agents, 'pnl_usdt' field in their result payload is prioritized.
@@ -66,8 +82,198 @@ AGENT_VALUE_ESTIMATES = {
 }
 
 
+# Source templates for the per-type value handlers. Every config constant is bound as a
+# default argument, so a handler call does no lookups on the value_config dict.
+_VALUE_HANDLER_SOURCES = {
+    "per_item": (
+        "def handler(task_type, payload, _value=value, _category=value_category):\n"
+        "    return _value, _category, f'Completed {task_type} task.'\n"
+    ),
+    "payload_field": (
+        "def handler(task_type, payload, _field=field, _default=default, _category=value_category, _prefix=f' result: {field} = ', _suffix=usd_suffix):\n"
+        "    task_value = payload.get(_field, _default)\n"
+        "    if isinstance(task_value, (int, float)):\n"
+        "        return task_value, _category, f'{task_type}{_prefix}{task_value}{_suffix}'\n"
+        "    return task_value, _category, f'{task_type}{_prefix}{task_value}'\n" # Value might not be USD here
+    ),
+    "per_item_conditional": (
+        "def handler(task_type, payload, _count_field=count_field, _value_per_item=value_per_item, _category=value_category):\n"
+        "    item_count = payload.get(_count_field, 0)\n"
+        "    task_value = item_count * _value_per_item\n"
+        "    return task_value, _category, f'{task_type} found {item_count} items, value {task_value:.2f} USD.'\n"
+    ),
+    "count_only": ( # No direct monetary value, just counted
+        "def handler(task_type, payload, _category=value_category):\n"
+        "    return 0.0, _category, f'Processed {task_type} task (operational).'\n"
+    ),
+}
+_FALLBACK_VALUE_HANDLER_SOURCE = (
+    "def handler(task_type, payload, _category=value_category):\n"
+    "    return 0.0, _category, f'Task type: {task_type}'\n"
+)
+
+
+def _compile_value_handler(value_config):
+    """Generates a handler(task_type, payload) -> (value, category, description) specialized to one AGENT_VALUE_ESTIMATES entry."""
+    value_category = value_config.get("value_category", "unknown")
+    field = value_config.get("field", "")
+    namespace = {
+        "value_category": value_category,
+        "value": value_config.get("value"),
+        "field": field,
+        "default": value_config.get("default", 0.0),
+        "usd_suffix": " USD" if "usd" in field.lower() or value_category == "fiat" else "",
+        "count_field": value_config.get("count_field"),
+        "value_per_item": value_config.get("value_per_item"),
+    }
+    exec(_VALUE_HANDLER_SOURCES.get(value_config["type"], _FALLBACK_VALUE_HANDLER_SOURCE), namespace)
+    return namespace["handler"]
+
+
+# Compiled once at import so the per-file hot path is a single dict lookup + call
+_VALUE_HANDLERS = {task_type: _compile_value_handler(value_config) for task_type, value_config in AGENT_VALUE_ESTIMATES.items()}
+_UNKNOWN_VALUE_HANDLER = _VALUE_HANDLERS["unknown_type_default"]
+
+
+def _dumps_metrics(metrics_data):
+    """Serializes metrics to pretty-printed, key-sorted UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(metrics_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(metrics_data, indent=2, sort_keys=True).encode('utf-8')
+
+
+def _loads_json(content):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either the same way
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass # orjson rejects the NaN/Infinity literals json.dumps writes by default; the stdlib parser still reads them
+    return json.loads(content)
+
+
+def _zero_non_finite_values(metrics):
+    """Replaces NaN/Infinity amounts an earlier run may have saved with 0.0 and recomputes the totals from the per-agent breakdowns."""
+    repaired = False
+    for breakdown_key in ("pnl_by_crypto_agent", "value_by_fiat_agent"):
+        for agent_type, value in metrics[breakdown_key].items():
+            if isinstance(value, float) and not math.isfinite(value):
+                metrics[breakdown_key][agent_type] = 0.0
+                repaired = True
+    for event in metrics.get("detailed_value_breakdown", []):
+        if isinstance(event.get("value_usd"), float) and not math.isfinite(event["value_usd"]):
+            event["value_usd"] = 0.0
+            repaired = True
+    if repaired or not all(math.isfinite(metrics[key]) for key in ("grand_total_value_usd", "total_crypto_pnl_usd", "total_fiat_value_usd")):
+        print("Warning: Existing metrics contain non-finite values. Resetting them to 0 and recomputing totals.")
+        metrics["total_crypto_pnl_usd"] = sum(metrics["pnl_by_crypto_agent"].values())
+        metrics["total_fiat_value_usd"] = sum(metrics["value_by_fiat_agent"].values())
+        metrics["grand_total_value_usd"] = metrics["total_crypto_pnl_usd"] + metrics["total_fiat_value_usd"]
+
+
+def _dumps_event_line(event):
+    """Serializes one value event as a single JSONL line (UTF-8 bytes, newline included)."""
+    if orjson is not None:
+        return orjson.dumps(event, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(event) + "\n").encode('utf-8')
+
+
+@functools.lru_cache(maxsize=1024)
+def _canonical_task_type(raw_task_type):
+    # A day's files share a handful of agent types, so this hands back one cached string per type
+    return raw_task_type.lower()
+
+
+# Per-object selections for _aliased_repository_query; the alias doubles as the variable name
+_TREE_ENTRIES_FIELD = """
+    {alias}: object(expression: ${alias}) {{
+      ... on Tree {{ entries {{ name type oid }} }}
+    }}"""
+_BLOB_TEXT_FIELD = """
+    {alias}: object(oid: ${alias}) {{
+      ... on Blob {{ text isTruncated }}
+    }}"""
+
+
+def _calculate_task_value(task_type, result_payload):
+    # Prioritize pnl_usdt if present, especially for crypto agents
+    if "pnl_usdt" in result_payload:
+        try:
+            task_value = float(result_payload["pnl_usdt"])
+        except (ValueError, TypeError):
+            print(f"Warning: Could not convert pnl_usdt '{result_payload['pnl_usdt']}' to float for {task_type}. Using configured method.")
+        else:
+            if math.isfinite(task_value): # "nan"/"inf" parse as floats but would poison the day's totals
+                value_category = "crypto" # Override category if pnl_usdt is found
+                description = f"{task_type} P&L: {task_value:.2f} USD"
+                return task_value, value_category, description
+            print(f"Warning: pnl_usdt '{result_payload['pnl_usdt']}' is not a finite number for {task_type}. Using configured method.")
+    
+    # Fallback to configured value calculation
+    task_value, value_category, description = (_VALUE_HANDLERS.get(task_type) or _UNKNOWN_VALUE_HANDLER)(task_type, result_payload)
+    
+    # Ensure task_value is float
+    try:
+        task_value = float(task_value)
+    except (ValueError, TypeError):
+        print(f"Warning: Could not convert final value '{task_value}' to float for task type {task_type}. Defaulting to 0.")
+        task_value = 0.0
+    if not math.isfinite(task_value):
+        print(f"Warning: Final value '{task_value}' is not a finite number for task type {task_type}. Defaulting to 0.")
+        task_value = 0.0
+
+    return task_value, value_category, description
+
+
+def _parse_and_value(file_name, file_path, content_bytes):
+    """Parses and values one fetched result file. Returns (record, error_message).
+
+    Module-level and free of tracker state, so it can run in a worker process.
+    """
+    if not content_bytes:
+        err_msg = f"Could not get content for {file_path}"
+        print(f"Error: {err_msg}. Skipping.")
+        return None, err_msg
+
+    try:
+        result_data = _loads_json(content_bytes)
+        base_name = file_name[:-5] if file_name.endswith(".json") else file_name
+        raw_task_type, separator, raw_task_id = base_name.partition("_") # Assumes AGENTTYPE_TASKID_TIMESTAMP.json or similar
+        task_type_from_filename = _canonical_task_type(raw_task_type)
+        task_id_from_filename = raw_task_id if separator else f"unknown_task_id_{file_name}"
+
+        # Aggregated into dicts keyed by task type, which must serialize as JSON object keys
+        task_type = str(result_data.get("agent_type", result_data.get("task_type", task_type_from_filename)))
+        task_id = result_data.get("task_id", task_id_from_filename) 
+        
+        task_payload = result_data.get("result", result_data) if isinstance(result_data.get("result"), dict) else result_data
+
+        value_usd, value_category, value_desc = _calculate_task_value(task_type, task_payload)
+        return (task_type, task_id, value_usd, value_category, value_desc), None
+
+    except json.JSONDecodeError:
+        err_msg = f"Error parsing JSON from result file {file_path}"
+        print(f"Error: {err_msg}. Skipping.")
+        return None, err_msg
+    except Exception as e:
+        err_msg = f"Unexpected error processing file {file_path}: {str(e)}"
+        print(f"Error: {err_msg}")
+        import traceback
+        traceback.print_exc()
+        return None, err_msg
+
+
+_CRYPTO_TABLE_HEADER = "| Agent Type | P&L (USD) |\n|------------|-----------|\n"
+_FIAT_TABLE_HEADER = "| Agent Type | Value Generated (USD) |\n|------------|-----------------------|\n"
+
+
+def _format_value_event(event):
+    category_tag = f"[{event['value_category'].upper()}] " if event['value_category'] != 'unknown' else ""
+    return f"- **{category_tag}{event['agent_type']} (Task {event.get('task_id', 'N/A')}):** ${event['value_usd']:.2f} USD - {event['description']}\n"
+
+
 # --- GitHub Interaction Helper Class (Consistent with other constellation scripts) ---
-class GitHubInteraction:
+class AsyncGitHubInteraction:
     def __init__(self, token):
         self.token = token
         self.headers = {
@@ -75,84 +281,244 @@ class GitHubInteraction:
             "Accept": "application/vnd.github.v3+json",
             "X-GitHub-Api-Version": "2022-11-28"
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-
-    def _request(self, method, endpoint, data=None, params=None, max_retries=3, base_url=GITHUB_API_URL):
+        # HTTP/2 multiplexes concurrent API calls over one TLS connection; the transport also
+        # retries failed connection attempts so a dropped connection doesn't cost a full request retry.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+        )
+        # The default 5s timeout is too tight for large blobs
+        self.client = httpx.AsyncClient(headers=self.headers, timeout=httpx.Timeout(30.0, connect=10.0), transport=transport)
+        # Callers can fan out freely with asyncio.gather; this keeps the number of in-flight requests bounded
+        self._request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # Epoch time before which no request is sent; shared so a low rate limit pauses every caller, not just one
+        self._rate_limit_resume_at = 0.0
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def _pause_until(self, resume_at, reason):
+        if resume_at > self._rate_limit_resume_at:
+            self._rate_limit_resume_at = resume_at
+            print(f"{reason} Pausing all GitHub API requests for {max(0, resume_at - time.time()):.2f} seconds.")
+
+    async def _wait_for_rate_limit(self):
+        while (remaining := self._rate_limit_resume_at - time.time()) > 0: # Re-checked in case the pause was extended meanwhile
+            await asyncio.sleep(remaining)
+
+    async def _request(self, method, endpoint, data=None, params=None, max_retries=5, base_url=GITHUB_API_URL):
         url = f"{base_url}{endpoint}"
         for attempt in range(max_retries):
             try:
-                response = self.session.request(method, url, params=params, json=data)
+                await self._wait_for_rate_limit()
+                async with self._request_slots: # Held only for the request itself, never across back-off sleeps
+                    response = await self.client.request(method, url, params=params, json=data)
                 if 'X-RateLimit-Remaining' in response.headers and int(response.headers['X-RateLimit-Remaining']) < 10:
                     reset_time = int(response.headers.get('X-RateLimit-Reset', time.time() + 60))
-                    sleep_duration = max(0, reset_time - time.time()) + 5
-                    print(f"Rate limit low. Sleeping for {sleep_duration:.2f} seconds.")
-                    time.sleep(sleep_duration)
+                    self._pause_until(reset_time + 5, "Rate limit low.") # This response is still good; later requests wait
                 response.raise_for_status()
                 return response.json() if response.content else {}
-            except requests.exceptions.HTTPError as e:
+            except httpx.HTTPStatusError as e:
                 if e.response.status_code == 403 and "rate limit exceeded" in e.response.text.lower():
                     reset_time = int(e.response.headers.get('X-RateLimit-Reset', time.time() + 60 * (attempt + 1)))
-                    sleep_duration = max(0, reset_time - time.time()) + 5
-                    print(f"Rate limit exceeded. Retrying in {sleep_duration:.2f}s (attempt {attempt+1}/{max_retries}).")
-                    time.sleep(sleep_duration)
+                    self._pause_until(reset_time + 5, f"Rate limit exceeded (attempt {attempt+1}/{max_retries}).")
+                    continue # The retry waits at the top of the loop along with every other caller
+                elif e.response.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries - 1:
+                    retry_after = e.response.headers.get('Retry-After')
+                    sleep_duration = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+                    print(f"GitHub API returned {e.response.status_code} ({method} {url}). Retrying in {sleep_duration:.2f}s (attempt {attempt+1}/{max_retries}).")
+                    await asyncio.sleep(sleep_duration)
                     continue
                 elif e.response.status_code == 404 and method == "GET": # File not found is okay for checks
                     return None
-                elif e.response.status_code == 422 and "No commit found for SHA" in e.response.text: # Trying to update a non-existent file with SHA
-                     return {"error": "file_not_found_for_update", "sha": None}
+                elif e.response.status_code == 422 and "not a fast forward" in e.response.text.lower(): # Branch moved under a ref update
+                     return {"error": "not_fast_forward", "sha": None}
                 print(f"GitHub API request failed ({method} {url}): {e.response.status_code} - {e.response.text}")
-                if attempt == max_retries - 1:
-                    raise
-            except requests.exceptions.RequestException as e:
+                raise # Other client errors won't succeed on a retry of the same request
+            except httpx.HTTPError as e:
                 print(f"GitHub API request failed ({method} {url}): {e}")
                 if attempt == max_retries - 1:
                     raise
-            time.sleep(2 ** attempt) # Exponential backoff
+            await asyncio.sleep(2 ** attempt) # Exponential backoff
         return {}
 
-    def list_files(self, repo_full_name, path):
-        endpoint = f"/repos/{repo_full_name}/contents/{path}"
-        response_data = self._request("GET", endpoint)
-        if response_data and isinstance(response_data, list):
-            return [item for item in response_data if item.get("type") == "file"]
-        return []
-
-    def get_file_content_and_sha(self, repo_full_name, file_path):
+    async def list_tree(self, repo_full_name, ref, dir_path):
+        """Lists the blobs directly under dir_path at ref in one Trees API call. Returns dicts with path, name and sha."""
+        # "<ref>:<path>" resolves just that subtree, so the response doesn't grow with the rest of the repo
+        endpoint = f"/repos/{repo_full_name}/git/trees/{ref}:{dir_path}"
+        tree_data = await self._request("GET", endpoint)
+        if not tree_data or "tree" not in tree_data:
+            return []
+        if tree_data.get("truncated"):
+            print(f"Warning: Tree listing for {ref}:{dir_path} was truncated by the API; some files may be missed.")
+        return [
+            {"path": f"{dir_path}/{item['path']}", "name": item["path"], "sha": item["sha"]}
+            for item in tree_data["tree"]
+            if item.get("type") == "blob"
+        ]
+
+    async def graphql(self, query, variables=None):
+        """Runs a GraphQL query. Returns its data, or None if the query failed."""
+        try:
+            response = await self._request("POST", "/graphql", data={"query": query, "variables": variables or {}})
+        except httpx.HTTPError:
+            return None
+        if not response or response.get("errors"):
+            print(f"GraphQL query failed: {response.get('errors') if response else 'empty response'}")
+            return None
+        return response.get("data")
+
+    async def _aliased_repository_query(self, repo_full_name, field_template, variable_type, values):
+        """Selects field_template once per value, each under its own alias, in one repository query.
+
+        Returns the selected objects in the order of values (None where GitHub returned null),
+        or None if the query failed.
+        """
+        owner, name = repo_full_name.split("/", 1)
+        aliases = [f"obj{index}" for index in range(len(values))]
+        variables = {"owner": owner, "name": name}
+        variables.update(zip(aliases, values))
+        query = (
+            "query($owner: String!, $name: String!, " + ", ".join(f"${alias}: {variable_type}!" for alias in aliases) + ") {\n"
+            "  repository(owner: $owner, name: $name) {"
+            + "".join(field_template.format(alias=alias) for alias in aliases)
+            + "\n  }\n}"
+        )
+        data = await self.graphql(query, variables)
+        if not data or not data.get("repository"):
+            return None
+        return [data["repository"].get(alias) for alias in aliases]
+
+    async def list_trees(self, repo_full_name, ref, dir_paths):
+        """Lists the blobs directly under each of dir_paths at ref in one GraphQL call.
+
+        Returns one list per directory of dicts with path, name and sha, or None if the query failed.
+        """
+        trees = await self._aliased_repository_query(repo_full_name, _TREE_ENTRIES_FIELD, "String", [f"{ref}:{dir_path}" for dir_path in dir_paths])
+        if trees is None:
+            return None
+        return [
+            [
+                {"path": f"{dir_path}/{entry['name']}", "name": entry["name"], "sha": entry["oid"]}
+                for entry in (tree or {}).get("entries", []) # null when the directory doesn't exist (yet)
+                if entry["type"] == "blob"
+            ]
+            for dir_path, tree in zip(dir_paths, trees)
+        ]
+
+    async def get_blob_contents(self, repo_full_name, blob_shas):
+        """Fetches many blobs' contents with batched GraphQL queries. Returns {blob_sha: bytes}.
+
+        Blobs GraphQL can't return as complete text (binary, oversized) or that are in a failed
+        batch are left out, for the caller to fetch another way.
+        """
+        unique_shas = list(dict.fromkeys(blob_shas))
+        batches = [unique_shas[start:start + GRAPHQL_BLOBS_PER_QUERY] for start in range(0, len(unique_shas), GRAPHQL_BLOBS_PER_QUERY)]
+        results = await asyncio.gather(*(self._aliased_repository_query(repo_full_name, _BLOB_TEXT_FIELD, "GitObjectID", batch) for batch in batches))
+        blob_contents = {}
+        for batch, blobs in zip(batches, results):
+            for blob_sha, blob in zip(batch, blobs or []):
+                if blob and blob.get("text") is not None and not blob.get("isTruncated"):
+                    blob_contents[blob_sha] = blob["text"].encode('utf-8')
+        return blob_contents
+
+    async def get_blob_content(self, repo_full_name, blob_sha):
+        """Returns a blob's content as bytes, or None if it couldn't be read."""
+        endpoint = f"/repos/{repo_full_name}/git/blobs/{blob_sha}"
+        blob_data = await self._request("GET", endpoint)
+        if blob_data and "content" in blob_data:
+            return base64.b64decode(blob_data["content"])
+        return None
+
+    async def get_file_content_and_sha(self, repo_full_name, file_path):
+        """Returns (content bytes, blob SHA), or (None, None) if the file doesn't exist."""
         endpoint = f"/repos/{repo_full_name}/contents/{file_path}"
-        file_data = self._request("GET", endpoint)
+        file_data = await self._request("GET", endpoint)
         if file_data and "content" in file_data and "sha" in file_data:
-            content = base64.b64decode(file_data["content"]).decode('utf-8')
-            return content, file_data["sha"]
+            return base64.b64decode(file_data["content"]), file_data["sha"]
         return None, None
 
-    def create_or_update_file(self, repo_full_name, file_path, content_str, commit_message, current_sha=None, branch="main"):
-        encoded_content = base64.b64encode(content_str.encode('utf-8')).decode('utf-8')
-        payload = {"message": commit_message, "content": encoded_content, "branch": branch}
-        if current_sha: # If SHA is provided, it's an update
-            payload["sha"] = current_sha
-        
-        endpoint = f"/repos/{repo_full_name}/contents/{file_path}"
-        response = self._request("PUT", endpoint, data=payload)
-        return response and "content" in response and "sha" in response["content"]
-
-    def delete_file(self, repo_full_name, file_path, sha, commit_message, branch="main"):
-        payload = {"message": commit_message, "sha": sha, "branch": branch}
-        endpoint = f"/repos/{repo_full_name}/contents/{file_path}"
-        response = self._request("DELETE", endpoint, data=payload)
-        return response is not None # DELETE returns 204 No Content on success, response is {}
+    async def _create_blob(self, repo_full_name, content):
+        # Text goes up as-is; base64 would add a third to the payload and an encode pass for nothing
+        try:
+            payload = {"content": content.decode('utf-8') if isinstance(content, bytes) else content, "encoding": "utf-8"}
+        except UnicodeDecodeError: # Binary blobs still need base64
+            payload = {"content": base64.b64encode(content).decode('ascii'), "encoding": "base64"}
+        response = await self._request("POST", f"/repos/{repo_full_name}/git/blobs", data=payload)
+        return response.get("sha") if response else None
+
+    async def _changed_paths(self, repo_full_name, ref, expected_blob_shas):
+        """Returns the paths whose blob SHA at ref differs from expected_blob_shas, listing each directory once."""
+        names_by_dir = {}
+        for path in expected_blob_shas:
+            dir_path, _, file_name = path.rpartition("/")
+            names_by_dir.setdefault(dir_path, []).append((path, file_name))
+        listings = await asyncio.gather(*(self.list_tree(repo_full_name, ref, dir_path) for dir_path in names_by_dir))
+        changed_paths = []
+        for names, listing in zip(names_by_dir.values(), listings):
+            current_shas = {file_info["name"]: file_info["sha"] for file_info in listing}
+            changed_paths += [path for path, file_name in names if current_shas.get(file_name) != expected_blob_shas[path]]
+        return changed_paths
+
+    async def batch_commit(self, repo_full_name, changes, commit_message, branch="main", max_attempts=3, expected_blob_shas=None):
+        """Writes all changes as one commit via the Git Data API.
+
+        changes maps file paths to new content (str or bytes), to {"sha": blob_sha} to point
+        the path at a blob already in the repository, or to None for deletions.
+        expected_blob_shas optionally maps paths to the blob SHA the changes were computed from
+        (None for a file that didn't exist); if any differs on the branch head, nothing is committed.
+        Returns the new commit SHA, or None if the commit could not be made.
+        """
+        if not changes:
+            return None
+        paths_to_write = [path for path, content in changes.items() if isinstance(content, (str, bytes))]
+        blob_shas = await asyncio.gather(*(self._create_blob(repo_full_name, changes[path]) for path in paths_to_write))
+        if not all(blob_shas):
+            print("Error: Failed to create one or more blobs for batch commit.")
+            return None
+
+        tree_entries = [{"path": path, "mode": "100644", "type": "blob", "sha": sha} for path, sha in zip(paths_to_write, blob_shas)]
+        tree_entries += [{"path": path, "mode": "100644", "type": "blob", "sha": content["sha"]} for path, content in changes.items() if isinstance(content, dict)]
+        tree_entries += [{"path": path, "mode": "100644", "type": "blob", "sha": None} for path, content in changes.items() if content is None]
+
+        for attempt in range(max_attempts):
+            ref_data = await self._request("GET", f"/repos/{repo_full_name}/git/ref/heads/{branch}")
+            if not ref_data:
+                print(f"Error: Could not resolve branch {branch} for batch commit.")
+                return None
+            base_commit_sha = ref_data["object"]["sha"]
+            # Like a Contents API write with a stale SHA: building on a head that changed these would overwrite or delete them
+            changed_paths = await self._changed_paths(repo_full_name, base_commit_sha, expected_blob_shas) if expected_blob_shas else []
+            if changed_paths:
+                print(f"Error: {', '.join(changed_paths)} changed on {branch} since they were read. Aborting batch commit.")
+                return None
+            base_commit = await self._request("GET", f"/repos/{repo_full_name}/git/commits/{base_commit_sha}")
+            tree = await self._request("POST", f"/repos/{repo_full_name}/git/trees", data={"base_tree": base_commit["tree"]["sha"], "tree": tree_entries})
+            if tree["sha"] == base_commit["tree"]["sha"]:
+                print("Batch commit would not change the tree. Skipping empty commit.")
+                return base_commit_sha
+            commit = await self._request("POST", f"/repos/{repo_full_name}/git/commits", data={"message": commit_message, "tree": tree["sha"], "parents": [base_commit_sha]})
+            updated_ref = await self._request("PATCH", f"/repos/{repo_full_name}/git/refs/heads/{branch}", data={"sha": commit["sha"], "force": False})
+            if updated_ref and updated_ref.get("error") != "not_fast_forward":
+                return commit["sha"]
+            print(f"Branch {branch} moved during batch commit. Rebuilding on new head (attempt {attempt+1}/{max_attempts}).")
+        return None
 
 
 # --- Results Tracking Logic ---
 class ResultsTracker:
     def __init__(self, github_token):
-        self.gh = GitHubInteraction(github_token)
-        self.today_date_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        self.gh = AsyncGitHubInteraction(github_token)
+        run_started_at = datetime.now(timezone.utc)
+        self.today_date_str = run_started_at.strftime('%Y-%m-%d')
         self.daily_metrics_path = f"{METRICS_DIR}/daily_metrics_{self.today_date_str}.json"
+        self.daily_events_dir = f"{METRICS_EVENTS_DIR}/{self.today_date_str}"
+        self.events_shard_path = f"{self.daily_events_dir}/{run_started_at.strftime('%H')}.jsonl"
 
-    def _load_daily_metrics(self):
+    async def _load_daily_metrics(self):
         print(f"Loading existing daily metrics from {self.daily_metrics_path}...")
-        content_str, sha = self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, self.daily_metrics_path)
+        content_bytes, sha = await self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, self.daily_metrics_path)
         
         default_metrics = {
             "date": self.today_date_str,
@@ -165,18 +531,20 @@ class ResultsTracker:
             "pnl_by_crypto_agent": {}, # {agent_type: total_pnl}
             "value_by_fiat_agent": {}, # {agent_type: total_value}
             "tasks_by_operational_agent": {}, # {agent_type: count}
-            "detailed_value_breakdown": [], # List of {task_id, agent_type, value_usd, value_category, description, file_path, processed_at}
-            "processed_result_file_shas": [], # List of SHAs of result files already included
-            "errors_processing_results": [] # List of {file_path, error_message, timestamp}
+            "processed_result_file_shas": set(), # SHAs of result files already included (sorted list on disk)
+            "errors_processing_results": [], # List of {file_path, error_message, timestamp}
+            "dashboard_body_sha256": None # Hash of the last committed dashboard, minus its timestamp
         }
 
-        if content_str:
+        if content_bytes:
             try:
-                metrics = json.loads(content_str)
+                metrics = _loads_json(content_bytes)
                 # Ensure all default keys are present
                 for key, default_value in default_metrics.items():
                     if key not in metrics:
                         metrics[key] = default_value
+                metrics["processed_result_file_shas"] = set(metrics["processed_result_file_shas"]) # O(1) membership checks
+                _zero_non_finite_values(metrics)
                 print("Existing metrics loaded and validated.")
                 return metrics, sha
             except json.JSONDecodeError:
@@ -185,252 +553,261 @@ class ResultsTracker:
         print("No existing metrics file found or file was invalid. Initializing new metrics for today.")
         return default_metrics, None
 
-    def _save_daily_metrics(self, metrics_data, current_sha):
-        print(f"Saving daily metrics to {self.daily_metrics_path}...")
-        content_str = json.dumps(metrics_data, indent=2)
-        commit_message = f"Update daily metrics and value report for {self.today_date_str}"
-        return self.gh.create_or_update_file(AGENT_RESULTS_REPO_FULL, self.daily_metrics_path, content_str, commit_message, current_sha)
-
-    def _calculate_task_value(self, task_type, result_payload):
-        value_config = AGENT_VALUE_ESTIMATES.get(task_type, AGENT_VALUE_ESTIMATES["unknown_type_default"])
-        task_value = 0.0
-        value_category = value_config.get("value_category", "unknown")
-        description = f"Task type: {task_type}"
-
-        # Prioritize pnl_usdt if present, especially for crypto agents
-        if "pnl_usdt" in result_payload:
-            try:
-                task_value = float(result_payload["pnl_usdt"])
-                value_category = "crypto" # Override category if pnl_usdt is found
-                description = f"{task_type} P&L: {task_value:.2f} USD"
-                return task_value, value_category, description
-            except (ValueError, TypeError):
-                print(f"Warning: Could not convert pnl_usdt '{result_payload['pnl_usdt']}' to float for {task_type}. Using configured method.")
-        
-        # Fallback to configured value calculation
-        if value_config["type"] == "per_item":
-            task_value = value_config["value"]
-            description = f"Completed {task_type} task."
-        elif value_config["type"] == "payload_field":
-            task_value = result_payload.get(value_config["field"], value_config.get("default", 0.0))
-            description = f"{task_type} result: {value_config['field']} = {task_value}" # Value might not be USD here
-            if isinstance(task_value, (int, float)):
-                 description += " USD" if "usd" in value_config['field'].lower() or value_category == "fiat" else ""
-        elif value_config["type"] == "per_item_conditional":
-            item_count = result_payload.get(value_config["count_field"], 0)
-            task_value = item_count * value_config["value_per_item"]
-            description = f"{task_type} found {item_count} items, value {task_value:.2f} USD."
-        elif value_config["type"] == "count_only":
-            task_value = 0.0 # No direct monetary value, just counted
-            description = f"Processed {task_type} task (operational)."
-        
-        # Ensure task_value is float
-        try:
-            task_value = float(task_value)
-        except (ValueError, TypeError):
-            print(f"Warning: Could not convert final value '{task_value}' to float for task type {task_type}. Defaulting to 0.")
-            task_value = 0.0
-
-        return task_value, value_category, description
+    def _save_daily_metrics(self, metrics_data, pending_changes):
+        print(f"Staging daily metrics for {self.daily_metrics_path}...")
+        # Per-task rows live in the hourly event shards, keeping this file small
+        # JSON has no set type; a sorted list also keeps the file's git diffs minimal
+        serializable_metrics = dict(metrics_data, processed_result_file_shas=sorted(metrics_data["processed_result_file_shas"]))
+        pending_changes[self.daily_metrics_path] = _dumps_metrics(serializable_metrics)
 
-    def _archive_processed_file(self, file_info, daily_results_path):
+    def _archive_processed_file(self, file_info, pending_changes, expected_blob_shas):
         source_path = file_info["path"]
         file_name = file_info["name"]
-        source_sha = file_info["sha"]
         
         archive_dir = f"{PROCESSED_OUTPUTS_DIR}/{self.today_date_str}"
         archive_path = f"{archive_dir}/{file_name}"
-        print(f"Archiving {source_path} to {archive_path}...")
-
-        content_str, _ = self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, source_path)
-        if content_str is None:
-            print(f"Error: Could not get content of {source_path} for archiving. Skipping archival.")
-            return False
-
-        # Create/Update file in archive
-        commit_archive_msg = f"Archive processed result file: {file_name} for {self.today_date_str}"
-        _, archive_sha = self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, archive_path) # Get SHA if exists
-        if not self.gh.create_or_update_file(AGENT_RESULTS_REPO_FULL, archive_path, content_str, commit_archive_msg, archive_sha):
-            print(f"Error: Failed to write {archive_path}. Archival failed.")
-            return False
-        
-        # Delete original file
-        commit_delete_msg = f"Delete processed result file: {file_name} from {daily_results_path}"
-        if not self.gh.delete_file(AGENT_RESULTS_REPO_FULL, source_path, source_sha, commit_delete_msg):
-            print(f"Error: Failed to delete {source_path} after archiving. Manual cleanup may be needed.")
-            return False # Non-ideal state, but SHA tracking prevents re-processing value.
-        
-        print(f"Successfully archived {file_name}.")
-        return True
-
-    def process_daily_results(self):
+        print(f"Staging archive of {source_path} to {archive_path}...")
+
+        # The archive entry reuses the source blob, so its content is never re-uploaded.
+        # Both tree changes land in the run's single batch commit.
+        pending_changes[archive_path] = {"sha": file_info["sha"]}
+        pending_changes[source_path] = None
+        expected_blob_shas[source_path] = file_info["sha"] # Never delete a version of the file this run hasn't counted
+
+    async def _fetch_blob_contents(self, file_infos):
+        """Returns each file's content as bytes (None if it couldn't be read), in order."""
+        for file_info in file_infos:
+            print(f"Fetching {file_info['path']} (SHA: {file_info['sha']})")
+        # Text blobs arrive in batched GraphQL queries; anything they miss is fetched by SHA over REST
+        blob_contents = await self.gh.get_blob_contents(AGENT_RESULTS_REPO_FULL, [file_info["sha"] for file_info in file_infos])
+
+        async def fetch(file_info):
+            if file_info["sha"] in blob_contents:
+                return blob_contents[file_info["sha"]]
+            # Raw bytes go straight to the JSON parser; there's no reason to decode them to str first
+            return await self.gh.get_blob_content(AGENT_RESULTS_REPO_FULL, file_info["sha"])
+
+        return await asyncio.gather(*(fetch(file_info) for file_info in file_infos))
+
+    def _value_result_files(self, new_files, contents):
+        """Parses and values fetched result files, in order. Returns a (record, error_message) pair per file."""
+        columns = ([file_info["name"] for file_info in new_files], [file_info["path"] for file_info in new_files], contents)
+        if sum(len(content_bytes) for content_bytes in contents if content_bytes) < PARALLEL_PARSE_MIN_BYTES:
+            return list(map(_parse_and_value, *columns))
+        # Nothing else is in flight between the fetch and commit phases, so blocking the loop here costs nothing
+        print(f"Parsing {len(new_files)} result files in worker processes...")
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            return list(executor.map(_parse_and_value, *columns, chunksize=32))
+
+    async def process_daily_results(self):
         print(f"\n--- Starting Results Processing for {self.today_date_str} ---")
-        daily_metrics, metrics_file_sha = self._load_daily_metrics()
+        now_iso = datetime.now(timezone.utc).isoformat() # One "batch processed at" timestamp for every row of this run
+        daily_metrics, metrics_file_sha = await self._load_daily_metrics()
+        prior_error_count = len(daily_metrics["errors_processing_results"])
         
         daily_results_path = f"{OUTPUTS_DIR}/{self.today_date_str}"
-        result_files = self.gh.list_files(AGENT_RESULTS_REPO_FULL, daily_results_path)
+        # One GraphQL round trip lists both directories; contents are fetched later, and only where needed
+        listings = await self.gh.list_trees(AGENT_RESULTS_REPO_FULL, "main", [daily_results_path, self.daily_events_dir])
+        if listings is None:
+            print("GraphQL listing failed. Falling back to REST tree listings.")
+            listings = await asyncio.gather(
+                self.gh.list_tree(AGENT_RESULTS_REPO_FULL, "main", daily_results_path),
+                self.gh.list_tree(AGENT_RESULTS_REPO_FULL, "main", self.daily_events_dir),
+            )
+        result_files, event_shards = listings
+        new_events = daily_metrics.pop("detailed_value_breakdown", []) # Rows logged before events were sharded move to a shard
+        pending_changes = {} # path -> new content, or None to delete; flushed as one commit
+        # path -> blob SHA the staged changes assume (None: absent); every staged change derives from the metrics as loaded
+        expected_blob_shas = {self.daily_metrics_path: metrics_file_sha}
+        new_files_processed_this_run = 0
 
-        if not result_files:
+        if result_files:
+            print(f"Found {len(result_files)} result files in {daily_results_path}.")
+        else:
             print(f"No result files found in {daily_results_path} for today.")
-            if metrics_file_sha is None: # If it was newly initialized
-                 self._save_daily_metrics(daily_metrics, metrics_file_sha)
-            self.generate_dashboard_markdown(daily_metrics)
-            print("--- Results Processing Finished (No new files) ---")
-            return
-
-        print(f"Found {len(result_files)} result files in {daily_results_path}.")
-        new_files_processed_this_run = 0
 
+        # Diff against already-processed blob SHAs before any content fetch
+        # Files with identical content share a blob SHA; only the first is counted, the rest stay in place and are skipped
+        new_files_by_sha = {}
         for file_info in result_files:
-            file_path = file_info["path"]
-            file_sha = file_info["sha"]
+            if file_info["sha"] not in daily_metrics["processed_result_file_shas"]:
+                new_files_by_sha.setdefault(file_info["sha"], file_info)
+        new_files = list(new_files_by_sha.values())
 
-            if file_sha in daily_metrics["processed_result_file_shas"]:
-                continue # Skip already processed file
-            
-            print(f"Processing new result file: {file_path} (SHA: {file_sha})")
-            content_str, _ = self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, file_path)
-            if not content_str:
-                err_msg = f"Could not get content for {file_path}"
-                print(f"Error: {err_msg}. Skipping.")
-                daily_metrics["errors_processing_results"].append({"file_path": file_path, "error": err_msg, "timestamp": datetime.now(timezone.utc).isoformat()})
-                continue
+        # Network I/O is the only concurrent phase; parsing and aggregation stay serial
+        contents = await self._fetch_blob_contents(new_files)
+        valued_files = self._value_result_files(new_files, contents)
 
-            try:
-                result_data = json.loads(content_str)
-                file_name_parts = file_info["name"].replace(".json", "").split("_", 1) # Assumes AGENTTYPE_TASKID_TIMESTAMP.json or similar
-                task_type_from_filename = file_name_parts[0]
-                task_id_from_filename = file_name_parts[1] if len(file_name_parts) > 1 else f"unknown_task_id_{file_info['name']}"
-
-                task_type = result_data.get("agent_type", result_data.get("task_type", task_type_from_filename))
-                task_id = result_data.get("task_id", task_id_from_filename) 
-                
-                task_payload = result_data.get("result", result_data) if isinstance(result_data.get("result"), dict) else result_data
-
-                value_usd, value_category, value_desc = self._calculate_task_value(task_type, task_payload)
-
-                if value_category == "crypto":
-                    daily_metrics["crypto_trades_count"] += 1
-                    daily_metrics["total_crypto_pnl_usd"] += value_usd
-                    daily_metrics["pnl_by_crypto_agent"].setdefault(task_type, 0.0)
-                    daily_metrics["pnl_by_crypto_agent"][task_type] += value_usd
-                elif value_category == "fiat":
-                    daily_metrics["fiat_tasks_count"] += 1
-                    daily_metrics["total_fiat_value_usd"] += value_usd
-                    daily_metrics["value_by_fiat_agent"].setdefault(task_type, 0.0)
-                    daily_metrics["value_by_fiat_agent"][task_type] += value_usd
-                elif value_category == "operational":
-                    daily_metrics["operational_tasks_count"] += 1
-                    daily_metrics["tasks_by_operational_agent"].setdefault(task_type, 0)
-                    daily_metrics["tasks_by_operational_agent"][task_type] += 1
-                
-                daily_metrics["grand_total_value_usd"] = daily_metrics["total_crypto_pnl_usd"] + daily_metrics["total_fiat_value_usd"]
-                
-                # Log all processed tasks, even with zero value, for completeness
-                daily_metrics["detailed_value_breakdown"].append({
-                    "task_id": task_id,
-                    "file_path": file_path,
-                    "agent_type": task_type,
-                    "value_usd": value_usd,
-                    "value_category": value_category,
-                    "description": value_desc,
-                    "processed_at": datetime.now(timezone.utc).isoformat()
-                })
-                
-                daily_metrics["processed_result_file_shas"].append(file_sha)
-                new_files_processed_this_run += 1
-                
-                self._archive_processed_file(file_info, daily_results_path)
+        for file_info, (record, err_msg) in zip(new_files, valued_files):
+            file_path = file_info["path"]
+            print(f"Processing new result file: {file_path}")
+            if record is None:
+                daily_metrics["errors_processing_results"].append({"file_path": file_path, "error": err_msg, "timestamp": now_iso})
+                continue
 
-            except json.JSONDecodeError:
-                err_msg = f"Error parsing JSON from result file {file_path}"
-                print(f"Error: {err_msg}. Skipping.")
-                daily_metrics["errors_processing_results"].append({"file_path": file_path, "error": err_msg, "timestamp": datetime.now(timezone.utc).isoformat()})
-            except Exception as e:
-                err_msg = f"Unexpected error processing file {file_path}: {str(e)}"
-                print(f"Error: {err_msg}")
-                daily_metrics["errors_processing_results"].append({"file_path": file_path, "error": err_msg, "timestamp": datetime.now(timezone.utc).isoformat()})
-                import traceback
-                traceback.print_exc()
+            task_type, task_id, value_usd, value_category, value_desc = record
+            if value_category == "crypto":
+                daily_metrics["crypto_trades_count"] += 1
+                daily_metrics["total_crypto_pnl_usd"] += value_usd
+                daily_metrics["pnl_by_crypto_agent"].setdefault(task_type, 0.0)
+                daily_metrics["pnl_by_crypto_agent"][task_type] += value_usd
+            elif value_category == "fiat":
+                daily_metrics["fiat_tasks_count"] += 1
+                daily_metrics["total_fiat_value_usd"] += value_usd
+                daily_metrics["value_by_fiat_agent"].setdefault(task_type, 0.0)
+                daily_metrics["value_by_fiat_agent"][task_type] += value_usd
+            elif value_category == "operational":
+                daily_metrics["operational_tasks_count"] += 1
+                daily_metrics["tasks_by_operational_agent"].setdefault(task_type, 0)
+                daily_metrics["tasks_by_operational_agent"][task_type] += 1
+            
+            daily_metrics["grand_total_value_usd"] = daily_metrics["total_crypto_pnl_usd"] + daily_metrics["total_fiat_value_usd"]
+            
+            # Log all processed tasks, even with zero value, for completeness
+            new_events.append({
+                "task_id": task_id,
+                "file_path": file_path,
+                "agent_type": task_type,
+                "value_usd": value_usd,
+                "value_category": value_category,
+                "description": value_desc,
+                "processed_at": now_iso
+            })
+            
+            daily_metrics["processed_result_file_shas"].add(file_info["sha"])
+            new_files_processed_this_run += 1
+            
+            self._archive_processed_file(file_info, pending_changes, expected_blob_shas)
         
-        if new_files_processed_this_run > 0 or daily_metrics["errors_processing_results"]:
-            if self._save_daily_metrics(daily_metrics, metrics_file_sha):
-                 # Get the new SHA after saving, important if dashboard commit relies on this SHA
-                 _, metrics_file_sha = self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, self.daily_metrics_path)
+        if new_files_processed_this_run == 0:
+            print("No new result files were processed in this run.")
+
+        # Idle runs (nothing new since the last commit) skip re-rendering and re-uploading entirely
+        if new_events or len(daily_metrics["errors_processing_results"]) != prior_error_count or metrics_file_sha is None:
+            value_events, events_shard_content = await self._load_value_events(event_shards)
+            dashboard_markdown = self.generate_dashboard_markdown(daily_metrics, value_events + new_events)
+            if self._update_dashboard_hash(daily_metrics, dashboard_markdown):
+                pending_changes[DASHBOARD_FILE] = dashboard_markdown
             else:
-                print("CRITICAL: Failed to save updated daily metrics after processing new files.")
+                print("Dashboard content unchanged since last update. Skipping dashboard write.")
+            self._save_daily_metrics(daily_metrics, pending_changes)
+            self._stage_value_events(new_events, events_shard_content, pending_changes)
         else:
-            print("No new result files were processed in this run.")
+            print("No new results or errors since the last run. Skipping metrics and dashboard updates.")
 
-        self.generate_dashboard_markdown(daily_metrics)
+        commit_message = f"Process {new_files_processed_this_run} result files and update metrics for {self.today_date_str}"
+        if not await self._commit_pending_changes(pending_changes, commit_message, expected_blob_shas) and new_files_processed_this_run > 0:
+            print("CRITICAL: Failed to commit updated daily metrics and archives after processing new files.")
         print(f"--- Results Processing Finished for {self.today_date_str} ---")
 
-    def generate_dashboard_markdown(self, metrics_data):
+    def _update_dashboard_hash(self, metrics_data, dashboard_markdown):
+        """Records the dashboard body hash in the metrics. Returns True if it differs from the committed one."""
+        # The "Last updated" footer changes every run and would defeat the comparison
+        body = "\n".join(line for line in dashboard_markdown.splitlines() if not line.startswith("*Last updated:"))
+        body_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        if metrics_data.get("dashboard_body_sha256") == body_hash:
+            return False
+        metrics_data["dashboard_body_sha256"] = body_hash
+        return True
+
+    async def _load_value_events(self, event_shards):
+        """Reads today's event shards. Returns (all events, current hour shard content as bytes, or b"")."""
+        value_events, events_shard_content = [], b""
+        for shard_info, content_bytes in zip(event_shards, await self._fetch_blob_contents(event_shards)):
+            shard_path = shard_info["path"]
+            if content_bytes is None:
+                if shard_path == self.events_shard_path: # Staging new rows would rewrite this shard without its existing ones
+                    raise RuntimeError(f"Could not read current event shard {shard_path}; aborting before anything is committed.")
+                print(f"Warning: Could not read event shard {shard_path}. Its events are omitted from the dashboard.")
+                continue
+            if shard_path == self.events_shard_path:
+                events_shard_content = content_bytes
+            value_events.extend(_loads_json(line) for line in content_bytes.splitlines() if line)
+        return value_events, events_shard_content
+
+    def _stage_value_events(self, new_events, events_shard_content, pending_changes):
+        if not new_events:
+            return
+        print(f"Staging {len(new_events)} value events for {self.events_shard_path}...")
+        # Append-only: only the current hour's shard is rewritten
+        pending_changes[self.events_shard_path] = events_shard_content + b"".join(_dumps_event_line(event) for event in new_events)
+
+    async def _commit_pending_changes(self, pending_changes, commit_message, expected_blob_shas):
+        if not pending_changes:
+            print("Nothing changed in this run. No commit needed.")
+            return None
+        print(f"Committing {len(pending_changes)} file changes in a single commit...")
+        commit_sha = await self.gh.batch_commit(AGENT_RESULTS_REPO_FULL, pending_changes, commit_message, expected_blob_shas=expected_blob_shas)
+        if commit_sha:
+            print(f"Batch commit {commit_sha} created successfully.")
+        else:
+            print("Error creating batch commit.")
+        return commit_sha
+
+    def generate_dashboard_markdown(self, metrics_data, value_events):
         print(f"Generating dashboard markdown ({DASHBOARD_FILE})...")
         
-        dashboard_content = [f"# AI Constellation Performance Dashboard - {metrics_data['date']}\n\n"]
-        dashboard_content.append(f"## Overall Summary ({metrics_data['date']})\n")
-        dashboard_content.append(f"- **Grand Total Value Generated (Crypto P&L + Fiat Value):** ${metrics_data['grand_total_value_usd']:.2f} USD\n")
-        dashboard_content.append(f"- **Total Crypto P&L:** ${metrics_data['total_crypto_pnl_usd']:.2f} USD from {metrics_data['crypto_trades_count']} trades/results\n")
-        dashboard_content.append(f"- **Total Estimated Fiat Value:** ${metrics_data['total_fiat_value_usd']:.2f} USD from {metrics_data['fiat_tasks_count']} tasks\n")
-        dashboard_content.append(f"- **Operational Tasks Processed:** {metrics_data['operational_tasks_count']}\n")
+        dashboard_content = [
+            f"# AI Constellation Performance Dashboard - {metrics_data['date']}\n\n"
+            f"## Overall Summary ({metrics_data['date']})\n"
+            f"- **Grand Total Value Generated (Crypto P&L + Fiat Value):** ${metrics_data['grand_total_value_usd']:.2f} USD\n"
+            f"- **Total Crypto P&L:** ${metrics_data['total_crypto_pnl_usd']:.2f} USD from {metrics_data['crypto_trades_count']} trades/results\n"
+            f"- **Total Estimated Fiat Value:** ${metrics_data['total_fiat_value_usd']:.2f} USD from {metrics_data['fiat_tasks_count']} tasks\n"
+            f"- **Operational Tasks Processed:** {metrics_data['operational_tasks_count']}\n"
+        ]
         
         dashboard_content.append("\n### Crypto P&L Breakdown by Agent (Today):\n")
         if metrics_data["pnl_by_crypto_agent"]:
-            dashboard_content.append("| Agent Type | P&L (USD) |\n")
-            dashboard_content.append("|------------|-----------|\n")
-            for agent_type, pnl in sorted(metrics_data["pnl_by_crypto_agent"].items(), key=lambda item: item[1], reverse=True):
-                dashboard_content.append(f"| {agent_type} | ${pnl:.2f} |\n")
+            dashboard_content.append(_CRYPTO_TABLE_HEADER)
+            dashboard_content.extend(f"| {agent_type} | ${pnl:.2f} |\n" for agent_type, pnl in sorted(metrics_data["pnl_by_crypto_agent"].items(), key=lambda item: item[1], reverse=True))
         else:
             dashboard_content.append("No crypto P&L recorded today.\n")
 
         dashboard_content.append("\n### Fiat Value Breakdown by Agent (Today):\n")
         if metrics_data["value_by_fiat_agent"]:
-            dashboard_content.append("| Agent Type | Value Generated (USD) |\n")
-            dashboard_content.append("|------------|-----------------------|\n")
-            for agent_type, value in sorted(metrics_data["value_by_fiat_agent"].items(), key=lambda item: item[1], reverse=True):
-                dashboard_content.append(f"| {agent_type} | ${value:.2f} |\n")
+            dashboard_content.append(_FIAT_TABLE_HEADER)
+            dashboard_content.extend(f"| {agent_type} | ${value:.2f} |\n" for agent_type, value in sorted(metrics_data["value_by_fiat_agent"].items(), key=lambda item: item[1], reverse=True))
         else:
             dashboard_content.append("No fiat value generated by specific agent types today.\n")
 
         dashboard_content.append("\n### Top Value Events (Today - Crypto & Fiat):\n")
-        if metrics_data["detailed_value_breakdown"]:
-            top_events = sorted(
-                [event for event in metrics_data["detailed_value_breakdown"] if event.get("value_usd", 0.0) != 0], 
-                key=lambda x: abs(x.get("value_usd", 0.0)), 
-                reverse=True
-            )[:15] # Show top 15 events with non-zero value
+        if value_events:
+            top_events = heapq.nlargest(
+                15, # Show top 15 events with non-zero value
+                (event for event in value_events if event.get("value_usd", 0.0) != 0),
+                key=lambda x: abs(x.get("value_usd", 0.0))
+            )
             if top_events:
-                for event in top_events:
-                    category_tag = f"[{event['value_category'].upper()}] " if event['value_category'] != 'unknown' else ""
-                    dashboard_content.append(f"- **{category_tag}{event['agent_type']} (Task {event.get('task_id', 'N/A')}):** ${event['value_usd']:.2f} USD - {event['description']}\n")
+                dashboard_content.extend(_format_value_event(event) for event in top_events)
             else:
                 dashboard_content.append("No specific value-generating events logged today.\n")
         else:
             dashboard_content.append("No detailed value events logged today.\n")
 
-        if metrics_data["errors_processing_results"]:
+        errors = metrics_data["errors_processing_results"]
+        if errors:
             dashboard_content.append("\n### Errors During Result Processing:\n")
-            for err in metrics_data["errors_processing_results"][:10]: # Show up to 10 errors
-                dashboard_content.append(f"- **File:** `{err['file_path']}` - **Error:** {err['error']} (at {err['timestamp']})\n")
-            if len(metrics_data["errors_processing_results"]) > 10:
-                dashboard_content.append(f"- ...and {len(metrics_data['errors_processing_results']) - 10} more errors.\n")
+            dashboard_content.extend(f"- **File:** `{err['file_path']}` - **Error:** {err['error']} (at {err['timestamp']})\n" for err in errors[:10]) # Show up to 10 errors
+            if len(errors) > 10:
+                dashboard_content.append(f"- ...and {len(errors) - 10} more errors.\n")
             
-        dashboard_content.append(f"\n---\n*Last updated: {datetime.now(timezone.utc).isoformat()}*\n")
-        dashboard_content.append(f"*View detailed daily metrics JSON [here](./{self.daily_metrics_path})*\n")
-        dashboard_content.append(f"*This dashboard is updated by the `results_tracker.py` script in the `agent-results` repository.*")
+        dashboard_content.append(
+            f"\n---\n*Last updated: {datetime.now(timezone.utc).isoformat()}*\n"
+            f"*View detailed daily metrics JSON [here](./{self.daily_metrics_path})*\n"
+            f"*Per-task value events are logged hourly [here](./{self.daily_events_dir}/)*\n"
+            "*This dashboard is updated by the `results_tracker.py` script in the `agent-results` repository.*"
+        )
 
+        return "".join(dashboard_content)
 
-        _, dashboard_sha = self.gh.get_file_content_and_sha(AGENT_RESULTS_REPO_FULL, DASHBOARD_FILE)
-        
-        commit_message = f"Update performance dashboard for {metrics_data['date']}"
-        if self.gh.create_or_update_file(AGENT_RESULTS_REPO_FULL, DASHBOARD_FILE, "".join(dashboard_content), commit_message, dashboard_sha):
-            print("Dashboard markdown updated successfully.")
-        else:
-            print("Error updating dashboard markdown.")
+    async def _run_async(self):
+        try:
+            await self.process_daily_results()
+        finally:
+            await self.gh.aclose()
 
     def run(self):
-        self.process_daily_results()
+        asyncio.run(self._run_async())
 
 if __name__ == "__main__":
     github_token = os.getenv("GH_PAT") # Ensure GH_PAT is used, not GITHUB_TOKEN for cross-repo